@@ -0,0 +1,220 @@
+"""
+上游响应缓存
+配置 redis_url 时使用 Redis（多 worker 共享），否则退化为进程内缓存
+上游请求失败时回退到已过期的缓存数据
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import time
+from typing import Callable, Optional
+
+import orjson
+from cachetools import TTLCache
+
+import config
+
+# 过期数据额外保留的倍数（用于上游失败时回退）
+STALE_FACTOR = 10
+
+# 缓存键前缀
+KEY_PREFIX = "mp"
+
+# 使用 Redis 时，进程内一级缓存的保留时长（秒）与容量
+LOCAL_TTL = 60
+LOCAL_MAXSIZE = 2048
+
+
+class _MemoryBackend:
+    """进程内缓存（按插入顺序淘汰）"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expire_at, value = entry
+        if time.monotonic() > expire_at:
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def close(self):
+        self._data.clear()
+
+
+class _RedisBackend:
+    """Redis 缓存（建议 Redis 配置 maxmemory-policy allkeys-lfu）"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        await self._redis.set(key, value, ex=ttl)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+if config.settings.redis_url:
+    _backend = _RedisBackend(config.settings.redis_url)
+    # 一级缓存：热点数据不必每次都访问 Redis 和反序列化
+    _local = TTLCache(maxsize=LOCAL_MAXSIZE, ttl=LOCAL_TTL)
+else:
+    _backend = _MemoryBackend()
+    _local = None
+
+
+async def close():
+    """关闭缓存后端连接"""
+    await _backend.close()
+
+
+class SingleFlight:
+    """合并同一个键的并发调用：只执行一次，所有调用方等待同一个结果
+
+    实际调用在独立任务中执行，任一调用方被取消都不会影响其他等待方。
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def run(self, key, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # 标记已读取，避免调用方都已取消时告警
+
+
+def _bind_arguments(signature: inspect.Signature, args, kwargs) -> dict:
+    """绑定调用参数（含默认值），去掉 self"""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop("self", None)
+    return arguments
+
+
+def _make_key(name: str, arguments: dict) -> str:
+    digest = hashlib.blake2b(
+        orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{name}:{digest}"
+
+
+def cached(ttl: int, decode: Callable = None):
+    """缓存异步函数/方法的返回值
+
+    缓存键由函数名和绑定后的参数（不含 self）生成，结果需可被 orjson 序列化。
+    使用 Redis 时在进程内再缓存最多 LOCAL_TTL 秒，命中时返回共享对象，调用方不应修改。
+    过期后重新请求上游（同一个键的并发请求合并为一次）；
+    上游失败时返回过期数据，没有可用数据才抛出异常。
+
+    Args:
+        ttl: 数据新鲜时长（秒）
+        decode: 可选，将反序列化得到的 JSON 数据还原为原返回类型（如 dataclass），
+                保证命中与未命中时返回值类型一致
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        flight = SingleFlight()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = _make_key(func.__qualname__, _bind_arguments(signature, args, kwargs))
+
+            if _local is not None:
+                entry = _local.get(key)
+                if entry is not None and entry["t"] > time.time():
+                    return entry["v"]
+
+            stale = None
+            try:
+                raw = await _backend.get(key)
+            except Exception:
+                raw = None
+            if raw is not None:
+                entry = orjson.loads(raw)
+                if entry["t"] > time.time():
+                    if decode is not None:
+                        entry["v"] = decode(entry["v"])
+                    if _local is not None:
+                        _local[key] = entry
+                    return entry["v"]
+                stale = entry
+
+            async def load():
+                value = await func(*args, **kwargs)
+                entry = {"t": time.time() + ttl, "v": value}
+                if _local is not None:
+                    _local[key] = entry
+                try:
+                    await _backend.set(key, orjson.dumps(entry), ttl * STALE_FACTOR)
+                except Exception:
+                    pass
+                return value
+
+            try:
+                return await flight.run(key, load)
+            except Exception:
+                if stale is not None:
+                    return decode(stale["v"]) if decode is not None else stale["v"]
+                raise
+
+        return wrapper
+    return decorator
+
+
+def ttl_cached(ttl: int, maxsize: int = 128):
+    """进程内 TTL 缓存异步函数/方法的返回值
+
+    不经过 Redis，适合短时间内频繁调用的轻量接口；
+    并发的未命中调用会合并为一次上游请求。
+
+    Args:
+        ttl: 缓存时长（秒）
+        maxsize: 最大缓存条目数
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        store = TTLCache(maxsize=maxsize, ttl=ttl)
+        flight = SingleFlight()
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = tuple(_bind_arguments(signature, args, kwargs).items())
+            try:
+                return store[key]
+            except KeyError:
+                pass
+
+            async def load():
+                value = await func(*args, **kwargs)
+                store[key] = value
+                return value
+
+            return await flight.run(key, load)
+
+        return wrapper
+    return decorator
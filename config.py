@@ -3,51 +3,72 @@ MoviePilot 配置管理模块
 从 config_base.txt 读取配置，支持环境变量覆盖
 """
 import os
+from dataclasses import dataclass
 
-# 默认配置
-BASE_URL = ""
-API_KEY = ""
-TMDB_TOKEN = ""  # TMDB Read Access Token
-
-# 本服务监听端口
-SERVICE_PORT = 8899
-SERVICE_HOST = "0.0.0.0"
-
-
-def load_config(config_file: str = "config_base.txt"):
-    """从配置文件加载配置"""
-    global BASE_URL, API_KEY, TMDB_TOKEN
-
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
-
-    if os.path.exists(config_path):
-        with open(config_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" in line:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    if key == "base_url":
-                        BASE_URL = value.rstrip("/")
-                    elif key == "api_key":
-                        API_KEY = value
-                    elif key == "tmdb_read_access_token":
-                        TMDB_TOKEN = value
-
-    # 环境变量覆盖
-    BASE_URL = os.environ.get("MP_BASE_URL", BASE_URL)
-    API_KEY = os.environ.get("MP_API_KEY", API_KEY)
-    TMDB_TOKEN = os.environ.get("TMDB_TOKEN", TMDB_TOKEN)
-    SERVICE_PORT_ENV = os.environ.get("SERVICE_PORT")
-    if SERVICE_PORT_ENV:
-        globals()["SERVICE_PORT"] = int(SERVICE_PORT_ENV)
-
-    if not BASE_URL or not API_KEY:
-        raise ValueError("请配置 base_url 和 api_key（config_base.txt 或环境变量）")
+# 配置文件键名 -> Settings 字段名
+_FILE_KEYS = {
+    "base_url": "base_url",
+    "api_key": "api_key",
+    "tmdb_read_access_token": "tmdb_token",
+    "redis_url": "redis_url",
+}
+
+# 环境变量名 -> Settings 字段名
+_ENV_KEYS = {
+    "MP_BASE_URL": "base_url",
+    "MP_API_KEY": "api_key",
+    "TMDB_TOKEN": "tmdb_token",
+    "REDIS_URL": "redis_url",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """服务配置（加载后不可变）"""
+    base_url: str = ""
+    api_key: str = ""
+    tmdb_token: str = ""  # TMDB Read Access Token
+    redis_url: str = ""  # 可选，配置后使用 Redis 缓存上游响应
+    # 本服务监听地址
+    host: str = "0.0.0.0"
+    port: int = 8899
+    workers: int = 1  # 工作进程数，默认按 CPU 核数加载
+
+    @classmethod
+    def load(cls, config_file: str = "config_base.txt") -> "Settings":
+        """从配置文件加载配置，环境变量优先"""
+        values = {}
+
+        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
+
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    if "=" in line:
+                        key, value = line.split("=", 1)
+                        field = _FILE_KEYS.get(key.strip())
+                        if field:
+                            values[field] = value.strip().strip('"').strip("'")
+
+        # 环境变量覆盖
+        for env, field in _ENV_KEYS.items():
+            if env in os.environ:
+                values[field] = os.environ[env]
+        if os.environ.get("SERVICE_PORT"):
+            values["port"] = int(os.environ["SERVICE_PORT"])
+        values["workers"] = int(os.environ.get("WORKERS") or os.cpu_count() or 1)
+
+        if "base_url" in values:
+            values["base_url"] = values["base_url"].rstrip("/")
+
+        settings = cls(**values)
+        if not settings.base_url or not settings.api_key:
+            raise ValueError("请配置 base_url 和 api_key（config_base.txt 或环境变量）")
+        return settings
 
 
 # 启动时自动加载
-load_config()
+settings = Settings.load()
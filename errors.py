@@ -0,0 +1,17 @@
+"""
+上游服务异常
+"""
+
+
+class UpstreamError(Exception):
+    """上游（MoviePilot / TMDB）请求失败
+
+    Attributes:
+        path: 请求路径
+        status: 上游 HTTP 状态码（超时/连接失败等情况为 None）
+    """
+
+    def __init__(self, message: str, path: str, status: int = None):
+        super().__init__(message)
+        self.path = path
+        self.status = status
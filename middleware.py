@@ -0,0 +1,62 @@
+"""
+ASGI 中间件
+轻量 CORS：允许任意来源/方法/请求头，不经过 Starlette 的 HTTP 中间件封装
+"""
+
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+MAX_AGE = b"600"
+
+
+class FastCORS:
+    """纯 ASGI 的 CORS 处理
+
+    - 预检请求（OPTIONS + Access-Control-Request-Method）直接返回 204
+    - 其他带 Origin 的请求在 http.response.start 时追加 CORS 响应头
+    - 回显请求的 Origin，以便携带凭证（allow_credentials）
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+        # 预检请求
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            cors_headers.append((b"access-control-allow-methods", ALLOW_METHODS))
+            cors_headers.append((b"access-control-max-age", MAX_AGE))
+            if request_headers:
+                cors_headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": cors_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
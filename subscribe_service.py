@@ -2,13 +2,21 @@
 订阅服务 - 业务逻辑层
 组合 MPClient 提供高层业务功能
 """
-from typing import Optional, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Optional, List
+from cachetools import TTLCache
+from cache import SingleFlight, cached, ttl_cached
 from mp_client import MPClient
-from tmdb_client import TMDBClient
+from tmdb_client import TMDBClient, TMDBClientError
+from utils import unique_by
 
-# 语言代码映射（方便用中文查询）
-LANGUAGE_MAP = {
+# 语言代码映射（方便用中文查询，只读）
+LANGUAGE_MAP = MappingProxyType({
     "韩语": "ko", "韩": "ko", "korean": "ko", "ko": "ko",
     "日语": "ja", "日": "ja", "japanese": "ja", "ja": "ja",
     "中文": "zh", "中": "zh", "chinese": "zh", "zh": "zh",
@@ -16,7 +24,70 @@ LANGUAGE_MAP = {
     "法语": "fr", "法": "fr", "french": "fr", "fr": "fr",
     "西班牙语": "es", "spanish": "es", "es": "es",
     "泰语": "th", "泰": "th", "thai": "th", "th": "th",
-}
+})
+
+# 已是语言代码的输入无需查表
+_ISO_CODES = frozenset(LANGUAGE_MAP.values())
+
+
+@lru_cache(maxsize=64)
+def resolve_lang(lang: str) -> str:
+    """将语言参数（代码或中文/英文名）解析为 ISO 639-1 代码"""
+    code = lang.lower()
+    return code if code in _ISO_CODES else LANGUAGE_MAP.get(code, code)
+
+# 订阅列表索引缓存时长（秒）
+SUBSCRIBE_INDEX_TTL = 10
+
+# TMDB Discover 固定每页 20 条
+DISCOVER_PAGE_SIZE = 20
+
+# 逐条查询语言时的最大并发数（不超过 MPClient 连接池上限）
+LANG_LOOKUP_CONCURRENCY = 20
+
+# 条目原始语言缓存 {(tmdb_id, type): original_language}
+# 原始语言基本不变，缓存较久；查询失败/无结果的条目缓存较短时间后重试
+_LANG_CACHE = TTLCache(maxsize=10000, ttl=1800)
+_LANG_MISS_CACHE = TTLCache(maxsize=10000, ttl=120)
+
+# 合并并发请求中对同一条目的语言查询
+_LANG_FLIGHT = SingleFlight()
+
+
+@dataclass(slots=True)
+class MediaItem:
+    """媒体信息（接口返回的简洁格式）"""
+    title: str = ""
+    year: str = ""
+    type: str = ""
+    tmdb_id: Optional[int] = None
+    douban_id: Optional[str] = None
+    language: str = ""
+    rating: float = 0
+    overview: str = ""
+    poster: str = ""
+    backdrop: str = ""
+    season: Optional[int] = None
+
+
+@dataclass(slots=True)
+class SubscribeItem:
+    """订阅信息（接口返回的简洁格式）"""
+    id: Optional[int] = None
+    name: str = ""
+    year: str = ""
+    type: str = ""
+    tmdb_id: Optional[int] = None
+    season: Optional[int] = None
+    poster: str = ""
+    rating: float = 0
+    description: str = ""
+    state: str = ""
+
+
+def _media_items(values: list) -> List[MediaItem]:
+    """缓存命中时把反序列化得到的 dict 还原为 MediaItem"""
+    return [MediaItem(**v) for v in values]
 
 
 class SubscribeService:
@@ -25,69 +96,172 @@ class SubscribeService:
     def __init__(self, client: MPClient = None, tmdb: TMDBClient = None):
         self.client = client or MPClient()
         self.tmdb = tmdb or TMDBClient()
+        # 订阅索引 {(tmdbid, season): 订阅}，供 check_subscribe 使用
+        self._subs_index: Optional[dict] = None
+        self._subs_index_expiry = 0.0
+        self._subs_index_lock = asyncio.Lock()
+        # 每次失效加一；刷新期间代数变化说明拉取到的列表可能已过时，不写回
+        self._subs_index_generation = 0
 
     # ==================== 语言查询辅助 ====================
 
-    def _get_language_for_item(self, item: dict) -> str:
+    async def _get_language_for_item(self, item: dict) -> str:
         """查询单个条目的 original_language（通过 TMDB 详情）"""
         tmdb_id = item.get("tmdb_id")
         media_type = item.get("type", "电视剧")
         if not tmdb_id:
             return ""
-        try:
-            detail = self.client.get_media_detail(
-                f"tmdb:{tmdb_id}", type_name=media_type
-            )
-            return detail.get("original_language", "") if detail else ""
-        except Exception:
+
+        key = (tmdb_id, media_type)
+        lang = _LANG_CACHE.get(key)
+        if lang is not None:
+            return lang
+        if key in _LANG_MISS_CACHE:
             return ""
 
-    def _enrich_and_filter_by_lang(self, items: list, lang: str,
-                                    target_count: int) -> list:
-        """批量查询语言并过滤
+        async def load() -> str:
+            try:
+                detail = await self.client.get_media_detail(
+                    f"tmdb:{tmdb_id}", type_name=media_type
+                )
+                lang = detail.get("original_language", "") if detail else ""
+            except Exception:
+                lang = ""
+
+            if lang:
+                _LANG_CACHE[key] = lang
+            else:
+                _LANG_MISS_CACHE[key] = True
+            return lang
+
+        return await _LANG_FLIGHT.run(key, load)
+
+    async def _iter_enriched(self, items: list, lang: str,
+                             target_count: int) -> AsyncIterator[dict]:
+        """批量查询语言并过滤，按到达顺序逐条产出匹配的条目
 
         Args:
             items: 原始列表
             lang: 语言代码 (ko/ja/zh/en...) 或中文名
-            target_count: 目标返回数量
+            target_count: 最多产出的条目数
         """
         # 解析语言代码
-        lang_code = LANGUAGE_MAP.get(lang.lower(), lang.lower())
-
-        results = []
+        lang_code = resolve_lang(lang)
+
+        # 上游已带 original_language 的条目直接过滤，其余才需要查询；
+        # 同一媒体（如不同季）只查一次，{(tmdb_id, type): [条目]}
+        matched = 0
+        need_lookup = {}
+        for item in items:
+            item_lang = item.get("original_language")
+            if not item_lang:
+                tmdb_id = item.get("tmdb_id")
+                if tmdb_id:
+                    need_lookup.setdefault((tmdb_id, item.get("type", "电视剧")), []).append(item)
+            elif item_lang == lang_code:
+                yield item
+                matched += 1
+                if matched >= target_count:
+                    return
+        if not need_lookup:
+            return
+
+        semaphore = asyncio.Semaphore(LANG_LOOKUP_CONCURRENCY)
+
+        async def lookup(group: list):
+            async with semaphore:
+                return group, await self._get_language_for_item(group[0])
 
         # 并发查询 TMDB 详情获取语言
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_item = {
-                executor.submit(self._get_language_for_item, item): item
-                for item in items
-            }
-            for future in as_completed(future_to_item):
-                item = future_to_item[future]
+        tasks = [asyncio.ensure_future(lookup(group)) for group in need_lookup.values()]
+        try:
+            for future in asyncio.as_completed(tasks):
                 try:
-                    item_lang = future.result()
-                    item["_original_language"] = item_lang
-                    if item_lang == lang_code:
-                        results.append(item)
-                        if len(results) >= target_count:
-                            # 取消剩余任务
-                            for f in future_to_item:
-                                f.cancel()
-                            break
+                    group, item_lang = await future
                 except Exception:
-                    pass
-
-        return results
+                    continue
+                for item in group:
+                    item["_original_language"] = item_lang
+                if item_lang != lang_code:
+                    continue
+                for item in group:
+                    yield item
+                    matched += 1
+                    if matched >= target_count:
+                        return
+        finally:
+            # 凑够数量、出错或调用方提前结束时，中止排队中和进行中的查询
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     # ==================== 热播内容 ====================
 
-    def get_hot_tv(self, page: int = 1, count: int = 20,
-                   genre_id: int = None, min_rating: float = None,
-                   lang: str = None) -> list:
+    async def _iter_discover(self, discover: Callable, lang: str, offset: int,
+                             genre_id: int, min_rating: float) -> AsyncIterator[MediaItem]:
+        """从第 offset 条（从 0 开始）起逐页拉取 TMDB Discover 结果，到最后一页为止"""
+        start_page, skip = divmod(offset, DISCOVER_PAGE_SIZE)
+        seen = set()
+        for p in itertools.count(start_page + 1):
+            data = await discover(
+                lang=resolve_lang(lang),
+                page=p,
+                min_vote_average=min_rating,
+                with_genres=str(genre_id) if genre_id is not None else None,
+            )
+            results = data["results"]
+            if skip:
+                results, skip = results[skip:], 0
+            for item in results:
+                # 热度排序在翻页期间可能变化，跨页去重
+                if item["tmdb_id"] in seen:
+                    continue
+                seen.add(item["tmdb_id"])
+                yield self._format_tmdb_media(item)
+            if p >= data["total_pages"]:
+                return
+
+    @staticmethod
+    async def _take(items: AsyncIterator[MediaItem], count: int) -> List[MediaItem]:
+        """从异步迭代器中取前 count 条，取够后关闭迭代器（不再拉取后续页）"""
+        result = []
+        try:
+            async for item in items:
+                result.append(item)
+                if len(result) >= count:
+                    break
+        finally:
+            await items.aclose()
+        return result
+
+    def iter_hot_tv(self, lang: str, offset: int = 0, genre_id: int = None,
+                    min_rating: float = None) -> AsyncIterator[MediaItem]:
+        """按原始语言逐页获取热播电视剧，调用方取够数量即可停止迭代，不会多拉后续页
+
+        Args:
+            offset: 跳过的条目数，与 TMDB 分页大小无关
+        """
+        return self._iter_discover(self.tmdb.discover_tv, lang, offset, genre_id, min_rating)
+
+    def iter_hot_movies(self, lang: str, offset: int = 0, genre_id: int = None,
+                        min_rating: float = None) -> AsyncIterator[MediaItem]:
+        """按原始语言逐页获取热播电影，调用方取够数量即可停止迭代，不会多拉后续页
+
+        Args:
+            offset: 跳过的条目数，与 TMDB 分页大小无关
+        """
+        return self._iter_discover(self.tmdb.discover_movie, lang, offset, genre_id, min_rating)
+
+    @cached(ttl=300, decode=_media_items)
+    async def get_hot_tv(self, page: int = 1, count: int = 20,
+                         genre_id: int = None, min_rating: float = None,
+                         lang: str = None) -> List[MediaItem]:
         """获取热播电视剧
 
         Args:
-            lang: 可选，语言过滤。支持代码(ko/ja/zh/en)或中文(韩语/日语)
+            lang: 可选，语言过滤。支持代码(ko/ja/zh/en)或中文(韩语/日语)。
+                  优先通过 TMDB Discover 按原始语言筛选热门内容（按需翻页），
+                  TMDB 不可用时回退到 MP 热门 + 逐条查询语言。
         """
         kwargs = {}
         if genre_id is not None:
@@ -96,26 +270,37 @@ class SubscribeService:
             kwargs["min_rating"] = min_rating
 
         if lang:
-            # 开启语言过滤：拉取更多数据再过滤
+            discovered = self.iter_hot_tv(lang, offset=(page - 1) * count,
+                                          genre_id=genre_id, min_rating=min_rating)
+            try:
+                return await self._take(discovered, count)
+            except TMDBClientError:
+                # 仅 TMDB 请求失败时回退，其他异常照常抛出
+                pass
+
+            # 回退：拉取更多数据再过滤
             fetch_count = count * 5  # 多拉取以保证过滤后够用
-            shows = self.client.get_popular_subscribes(
+            shows = await self.client.get_popular_subscribes(
                 stype="电视剧", page=page, count=fetch_count, **kwargs
             )
-            filtered = self._enrich_and_filter_by_lang(shows, lang, count)
-            return [self._format_media(item) for item in filtered]
+            return [self._format_media(item) async for item in self._iter_enriched(
+                unique_by(shows, "tmdb_id", "season"), lang, count)]
         else:
-            shows = self.client.get_popular_subscribes(
-                stype="电视剧", page=page, count=count, **kwargs
-            )
-            return [self._format_media(item) for item in shows]
-
-    def get_hot_movies(self, page: int = 1, count: int = 20,
-                       genre_id: int = None, min_rating: float = None,
-                       lang: str = None) -> list:
+            return [self._format_media(item) for item in unique_by(
+                await self.client.get_popular_subscribes(
+                    stype="电视剧", page=page, count=count, **kwargs
+                ), "tmdb_id", "season")]
+
+    @cached(ttl=300, decode=_media_items)
+    async def get_hot_movies(self, page: int = 1, count: int = 20,
+                             genre_id: int = None, min_rating: float = None,
+                             lang: str = None) -> List[MediaItem]:
         """获取热播电影
 
         Args:
-            lang: 可选，语言过滤。支持代码(ko/ja/zh/en)或中文(韩语/日语)
+            lang: 可选，语言过滤。支持代码(ko/ja/zh/en)或中文(韩语/日语)。
+                  优先通过 TMDB Discover 按原始语言筛选热门内容（按需翻页），
+                  TMDB 不可用时回退到 MP 热门 + 逐条查询语言。
         """
         kwargs = {}
         if genre_id is not None:
@@ -124,89 +309,118 @@ class SubscribeService:
             kwargs["min_rating"] = min_rating
 
         if lang:
+            discovered = self.iter_hot_movies(lang, offset=(page - 1) * count,
+                                              genre_id=genre_id, min_rating=min_rating)
+            try:
+                return await self._take(discovered, count)
+            except TMDBClientError:
+                # 仅 TMDB 请求失败时回退，其他异常照常抛出
+                pass
+
+            # 回退：拉取更多数据再过滤
             fetch_count = count * 5
-            movies = self.client.get_popular_subscribes(
+            movies = await self.client.get_popular_subscribes(
                 stype="电影", page=page, count=fetch_count, **kwargs
             )
-            filtered = self._enrich_and_filter_by_lang(movies, lang, count)
-            return [self._format_media(item) for item in filtered]
+            return [self._format_media(item) async for item in self._iter_enriched(
+                unique_by(movies, "tmdb_id", "season"), lang, count)]
         else:
-            movies = self.client.get_popular_subscribes(
-                stype="电影", page=page, count=count, **kwargs
-            )
-            return [self._format_media(item) for item in movies]
+            return [self._format_media(item) for item in unique_by(
+                await self.client.get_popular_subscribes(
+                    stype="电影", page=page, count=count, **kwargs
+                ), "tmdb_id", "season")]
 
     # ==================== 订阅管理 ====================
 
-    def list_subscribes(self) -> list:
+    async def list_subscribes(self) -> List[SubscribeItem]:
         """获取当前所有订阅"""
-        subs = self.client.get_subscribes()
-        return [self._format_subscribe(s) for s in subs]
+        return [self._format_subscribe(s) for s in await self.client.get_subscribes()]
 
-    def subscribe_by_tmdbid(self, tmdbid: int, media_type: str = "电视剧",
-                             season: int = None) -> dict:
+    async def subscribe_by_tmdbid(self, tmdbid: int, media_type: str = "电视剧",
+                                  season: int = None, enrich: bool = False) -> dict:
         """通过 TMDB ID 订阅
 
-        优先使用 TMDB 原生 API 获取媒体信息（精确可靠），
-        如果 TMDB 不可用则回退到 MoviePilot 搜索。
+        MoviePilot 会根据 tmdbid 自行识别媒体信息，默认直接提交订阅。
+        enrich=True 时先补全名称/年份/海报等信息：优先使用 TMDB 原生 API
+        （精确可靠），如果 TMDB 不可用则回退到 MoviePilot 按 tmdbid 查询/搜索。
 
         Args:
             tmdbid: TMDB ID
             media_type: "电影" 或 "电视剧"
             season: 季号（仅电视剧）
+            enrich: 是否在提交前补全媒体信息（多一次上游请求）
         """
         sub_data = {
             "tmdbid": tmdbid,
             "type": media_type,
         }
 
+        if enrich:
+            await self._enrich_subscribe_data(sub_data, tmdbid, media_type)
+
+        if season is not None and media_type == "电视剧":
+            sub_data["season"] = season
+
+        result = await self.client.add_subscribe(sub_data)
+        self._invalidate_subscribe_index()
+        return result
+
+    async def _enrich_subscribe_data(self, sub_data: dict, tmdbid: int,
+                                     media_type: str):
+        """补全订阅数据中的名称/年份/海报等信息"""
         # 优先通过 TMDB 原生 API 获取详情（精确查询，不会丢失）
+        # MoviePilot 会按 tmdbid 重新识别元数据，这里不需要中文译名
         try:
             if media_type == "电影":
-                detail = self.tmdb.movie_detail(tmdbid)
+                detail = await self.tmdb.movie_detail(tmdbid, include_translations=False)
             else:
-                detail = self.tmdb.tv_detail(tmdbid)
-
-            if detail:
-                sub_data["name"] = detail.get("title", "")
-                # 从日期中提取年份
-                date_str = detail.get("first_air_date") or detail.get("release_date") or ""
-                sub_data["year"] = date_str[:4] if date_str else ""
-                sub_data["poster"] = detail.get("poster", "")
-                sub_data["backdrop"] = detail.get("backdrop", "")
-                sub_data["vote"] = detail.get("rating", 0)
-                sub_data["description"] = detail.get("overview", "")
+                detail = await self.tmdb.tv_detail(tmdbid, include_translations=False)
+        except Exception:
+            detail = None
+
+        if detail:
+            sub_data["name"] = detail.get("title", "")
+            # 从日期中提取年份
+            date_str = detail.get("first_air_date") or detail.get("release_date") or ""
+            sub_data["year"] = date_str[:4] if date_str else ""
+            sub_data["poster"] = detail.get("poster", "")
+            sub_data["backdrop"] = detail.get("backdrop", "")
+            sub_data["vote"] = detail.get("rating", 0)
+            sub_data["description"] = detail.get("overview", "")
+            return
+
+        # TMDB 不可用时，回退到 MoviePilot 按 tmdbid 精确查询
+        media_info = None
+        try:
+            media_info = await self.client.get_media_detail(f"tmdb:{tmdbid}", type_name=media_type)
         except Exception:
-            # TMDB 不可用时，回退到 MoviePilot 搜索
+            # 仍失败时才回退到文本搜索
             try:
-                results = self.client.search_media(sub_data.get("name", str(tmdbid)))
-                for r in results:
-                    if r.get("tmdb_id") == tmdbid:
-                        sub_data.setdefault("name", r.get("title", ""))
-                        sub_data.setdefault("year", r.get("year", ""))
-                        sub_data.setdefault("poster", r.get("poster_path", ""))
-                        sub_data.setdefault("backdrop", r.get("backdrop_path", ""))
-                        sub_data.setdefault("vote", r.get("vote_average", 0))
-                        sub_data.setdefault("description", r.get("overview", ""))
-                        break
+                results = await self.client.search_media(sub_data.get("name", str(tmdbid)))
+                by_id = {r.get("tmdb_id"): r for r in results}
+                media_info = by_id.get(tmdbid)
             except Exception:
                 pass
 
-        if season is not None and media_type == "电视剧":
-            sub_data["season"] = season
-
-        return self.client.add_subscribe(sub_data)
+        if media_info:
+            sub_data.setdefault("name", media_info.get("title", ""))
+            sub_data.setdefault("year", media_info.get("year", ""))
+            sub_data.setdefault("poster", media_info.get("poster_path", ""))
+            sub_data.setdefault("backdrop", media_info.get("backdrop_path", ""))
+            sub_data.setdefault("vote", media_info.get("vote_average", 0))
+            sub_data.setdefault("description", media_info.get("overview", ""))
 
-    def subscribe_by_title(self, title: str, media_type: str = None,
-                            season: int = None) -> dict:
+    async def subscribe_by_title(self, title: str, media_type: str = None,
+                                 season: int = None, enrich: bool = False) -> dict:
         """通过标题搜索并订阅第一个匹配结果
 
         Args:
             title: 媒体标题
             media_type: 可选，"电影" 或 "电视剧"，不指定则使用搜索结果的类型
             season: 季号（仅电视剧）
+            enrich: 是否在提交前补全媒体信息，见 subscribe_by_tmdbid
         """
-        results = self.client.search_media(title)
+        results = await self.client.search_media(title)
         if not results:
             return {"success": False, "message": f"未找到: {title}"}
 
@@ -216,42 +430,83 @@ class SubscribeService:
             return {"success": False, "message": f"无法获取 TMDB ID: {title}"}
 
         mtype = media_type or media.get("type", "电视剧")
-        return self.subscribe_by_tmdbid(tmdbid, media_type=mtype, season=season)
+        return await self.subscribe_by_tmdbid(tmdbid, media_type=mtype, season=season,
+                                              enrich=enrich)
 
-    def unsubscribe(self, subscribe_id: int) -> dict:
+    async def unsubscribe(self, subscribe_id: int) -> dict:
         """取消订阅"""
-        return self.client.delete_subscribe(subscribe_id)
+        result = await self.client.delete_subscribe(subscribe_id)
+        self._invalidate_subscribe_index()
+        return result
 
-    def check_subscribe(self, tmdbid: int, season: int = None) -> Optional[dict]:
+    def _invalidate_subscribe_index(self):
+        """新增/删除订阅后使订阅索引失效
+
+        仅作用于当前进程；多 worker 部署时其他进程最多在 SUBSCRIBE_INDEX_TTL 秒后刷新。
+        """
+        self._subs_index = None
+        self._subs_index_generation += 1
+
+    async def _get_subscribe_index(self) -> dict:
+        """获取订阅索引，短时间内复用，过期后只由一个请求刷新
+
+        未指定季号时 (tmdbid, None) 匹配该媒体的任意一条订阅。
+        刷新期间若索引被失效，本次拉取的结果只返回给当前调用方，不写回缓存。
+        """
+        if self._subs_index is not None and time.monotonic() < self._subs_index_expiry:
+            return self._subs_index
+        async with self._subs_index_lock:
+            if self._subs_index is not None and time.monotonic() < self._subs_index_expiry:
+                return self._subs_index
+
+            generation = self._subs_index_generation
+            index = {}
+            for sub in await self.client.get_subscribes():
+                tmdbid = sub.get("tmdbid")
+                if not tmdbid:
+                    continue
+                index.setdefault((tmdbid, sub.get("season") or None), sub)
+                index.setdefault((tmdbid, None), sub)
+            if generation == self._subs_index_generation:
+                self._subs_index = index
+                self._subs_index_expiry = time.monotonic() + SUBSCRIBE_INDEX_TTL
+            return index
+
+    async def check_subscribe(self, tmdbid: int, season: int = None) -> Optional[dict]:
         """检查是否已订阅"""
-        mediaid = f"tmdb:{tmdbid}"
         try:
-            return self.client.get_subscribe_by_mediaid(mediaid, season=season)
+            index = await self._get_subscribe_index()
         except Exception:
             return None
+        return index.get((tmdbid, season or None))
 
     # ==================== 搜索 ====================
 
-    def search(self, title: str, page: int = 1, count: int = 8) -> list:
+    async def search(self, title: str, page: int = 1, count: int = 8) -> List[MediaItem]:
         """搜索媒体"""
-        results = self.client.search_media(title, page=page, count=count)
-        return [self._format_media(item) for item in results]
+        return [self._format_media(item)
+                for item in await self.client.search_media(title, page=page, count=count)]
 
     # ==================== 统计 ====================
 
-    def get_stats(self) -> dict:
+    @ttl_cached(ttl=30, maxsize=1)
+    async def get_stats(self) -> dict:
         """获取系统统计摘要"""
-        stat = self.client.get_statistic() or {}
-        storage = None
-        downloader = None
-        try:
-            storage = self.client.get_storage()
-        except Exception:
-            pass
-        try:
-            downloader = self.client.get_downloader_info()
-        except Exception:
-            pass
+        # 三个接口互不依赖，并发请求
+        stat, storage, downloader = await asyncio.gather(
+            self.client.get_statistic(),
+            self.client.get_storage(),
+            self.client.get_downloader_info(),
+            return_exceptions=True,
+        )
+        # 媒体统计失败则整体失败；存储/下载器信息失败时置空
+        if isinstance(stat, Exception):
+            raise stat
+        stat = stat or {}
+        if isinstance(storage, Exception):
+            storage = None
+        if isinstance(downloader, Exception):
+            downloader = None
 
         return {
             "media": {
@@ -267,34 +522,54 @@ class SubscribeService:
     # ==================== 格式化 ====================
 
     @staticmethod
-    def _format_media(item: dict) -> dict:
+    def _format_media(item: dict) -> MediaItem:
         """格式化媒体信息为简洁格式"""
-        return {
-            "title": item.get("title", ""),
-            "year": item.get("year", ""),
-            "type": item.get("type", ""),
-            "tmdb_id": item.get("tmdb_id"),
-            "douban_id": item.get("douban_id"),
-            "language": item.get("_original_language") or item.get("original_language", ""),
-            "rating": item.get("vote_average", 0),
-            "overview": item.get("overview", ""),
-            "poster": item.get("poster_path", ""),
-            "backdrop": item.get("backdrop_path", ""),
-            "season": item.get("season"),
-        }
+        # 按字段顺序传位置参数（比关键字参数快，缺字段时也不走异常路径）
+        get = item.get
+        return MediaItem(
+            get("title", ""),
+            get("year", ""),
+            get("type", ""),
+            get("tmdb_id"),
+            get("douban_id"),
+            get("_original_language") or get("original_language", ""),
+            get("vote_average", 0),
+            get("overview", ""),
+            get("poster_path", ""),
+            get("backdrop_path", ""),
+            get("season"),
+        )
 
     @staticmethod
-    def _format_subscribe(item: dict) -> dict:
+    def _format_tmdb_media(item: dict) -> MediaItem:
+        """将 TMDBClient 格式化后的条目转换为与 _format_media 相同的格式"""
+        get = item.get
+        date_str = get("first_air_date") or get("release_date") or ""
+        return MediaItem(
+            title=get("title", ""),
+            year=date_str[:4],
+            type=get("type", ""),
+            tmdb_id=get("tmdb_id"),
+            language=get("language", ""),
+            rating=get("rating", 0),
+            overview=get("overview", ""),
+            poster=get("poster", ""),
+            backdrop=get("backdrop", ""),
+        )
+
+    @staticmethod
+    def _format_subscribe(item: dict) -> SubscribeItem:
         """格式化订阅信息"""
-        return {
-            "id": item.get("id"),
-            "name": item.get("name", ""),
-            "year": item.get("year", ""),
-            "type": item.get("type", ""),
-            "tmdb_id": item.get("tmdbid"),
-            "season": item.get("season"),
-            "poster": item.get("poster", ""),
-            "rating": item.get("vote", 0),
-            "description": item.get("description", ""),
-            "state": item.get("state", ""),
-        }
+        get = item.get
+        return SubscribeItem(
+            get("id"),
+            get("name", ""),
+            get("year", ""),
+            get("type", ""),
+            get("tmdbid"),
+            get("season"),
+            get("poster", ""),
+            get("vote", 0),
+            get("description", ""),
+            get("state", ""),
+        )
@@ -2,41 +2,97 @@
 TMDB 原生 API 客户端
 使用 Read Access Token 直接调用 TMDB Discover/Search 接口
 """
-import requests
+import asyncio
+import httpx
+import orjson
 from typing import Optional, List
 import config
+from cache import cached
+from errors import UpstreamError
+from utils import unique_by
+
+# 请求超时时间（秒）
+TIMEOUT = 15
+
+# 连接池大小（并发查询共享长连接）
+POOL_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=16)
+
+# 重试：连接失败、限流与网关错误
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUS = {429, 502, 503, 504}
+
+# 中文译名参数（只读共享，不需要每次请求新建）
+LANG_PARAMS = {"language": "zh-CN"}
+
+
+class TMDBClientError(UpstreamError):
+    """TMDB 请求失败"""
 
 
 class TMDBClient:
     """TMDB API 客户端"""
 
+    __slots__ = ("token", "headers", "_img_prefix", "_client")
+
     BASE_URL = "https://api.themoviedb.org/3"
     IMAGE_BASE = "https://image.tmdb.org/t/p"
 
     def __init__(self, token: str = None):
-        self.token = token or config.TMDB_TOKEN
+        self.token = token or config.settings.tmdb_token
         if not self.token:
             raise ValueError("请配置 tmdb_read_access_token")
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "accept": "application/json",
         }
+        # 海报/背景图 URL 公共前缀
+        self._img_prefix = f"{self.IMAGE_BASE}/w500"
+        # TMDB 支持 HTTP/2，并发查询可复用同一连接多路传输
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=POOL_LIMITS, retries=RETRY_TOTAL)
+        self._client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            headers=self.headers,
+            timeout=TIMEOUT,
+            transport=transport,
+            follow_redirects=True,  # 与 requests 默认行为一致（如 http -> https 跳转）
+        )
+
+    async def aclose(self):
+        """关闭底层连接池"""
+        await self._client.aclose()
 
-    def _get(self, path: str, params: dict = None) -> dict:
+    async def _get(self, path: str, params: dict = None) -> dict:
         """发送 GET 请求"""
-        url = f"{self.BASE_URL}{path}"
-        resp = requests.get(url, params=params, headers=self.headers, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
+        try:
+            for attempt in range(RETRY_TOTAL + 1):
+                resp = await self._client.get(path, params=params)
+                if resp.status_code not in RETRY_STATUS or attempt == RETRY_TOTAL:
+                    break
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+            resp.raise_for_status()
+            return orjson.loads(resp.content)
+        except httpx.TimeoutException as e:
+            raise TMDBClientError(f"TMDB 请求超时: {path}", path) from e
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            raise TMDBClientError(f"TMDB HTTP 错误 {status}: {e.response.text}", path,
+                                  status=status) from e
+        except orjson.JSONDecodeError as e:
+            raise TMDBClientError(f"TMDB 响应解析失败: {path}", path) from e
+        except Exception as e:
+            raise TMDBClientError(f"TMDB 请求失败: {e}", path) from e
 
     # ==================== Discover (发现) ====================
 
-    def discover_tv(self, lang: str = "ko", sort_by: str = "popularity.desc",
-                    page: int = 1, min_vote_count: int = 5,
-                    min_vote_average: float = None,
-                    first_air_date_gte: str = None,
-                    first_air_date_lte: str = None,
-                    with_genres: str = None) -> dict:
+    @cached(ttl=1800)
+    async def discover_tv(self, lang: str = "ko", sort_by: str = "popularity.desc",
+                          page: int = 1, min_vote_count: int = 5,
+                          min_vote_average: float = None,
+                          first_air_date_gte: str = None,
+                          first_air_date_lte: str = None,
+                          with_genres: str = None,
+                          include_translations: bool = True) -> dict:
         """发现电视剧
 
         Args:
@@ -48,6 +104,8 @@ class TMDBClient:
             first_air_date_gte: 首播日期 >= (YYYY-MM-DD)
             first_air_date_lte: 首播日期 <= (YYYY-MM-DD)
             with_genres: 类型 ID (逗号分隔)
+            include_translations: 是否请求中文标题/简介；只需 ID、评分、语言时传 False，
+                                  响应与语言无关，更容易命中缓存
 
         Returns:
             {"page": 1, "total_pages": 519, "total_results": 10363, "results": [...]}
@@ -56,9 +114,10 @@ class TMDBClient:
             "with_original_language": lang,
             "sort_by": sort_by,
             "page": page,
-            "language": "zh-CN",
             "vote_count.gte": min_vote_count,
         }
+        if include_translations:
+            params.update(LANG_PARAMS)
         if min_vote_average:
             params["vote_average.gte"] = min_vote_average
         if first_air_date_gte:
@@ -68,20 +127,22 @@ class TMDBClient:
         if with_genres:
             params["with_genres"] = with_genres
 
-        data = self._get("/discover/tv", params=params)
+        data = await self._get("/discover/tv", params=params)
         return {
             "page": data.get("page", 1),
             "total_pages": data.get("total_pages", 0),
             "total_results": data.get("total_results", 0),
-            "results": [self._format_tv(item) for item in data.get("results", [])],
+            "results": [self._format_tv(item) for item in unique_by(data.get("results", []), "id")],
         }
 
-    def discover_movie(self, lang: str = "ko", sort_by: str = "popularity.desc",
-                       page: int = 1, min_vote_count: int = 5,
-                       min_vote_average: float = None,
-                       release_date_gte: str = None,
-                       release_date_lte: str = None,
-                       with_genres: str = None) -> dict:
+    @cached(ttl=1800)
+    async def discover_movie(self, lang: str = "ko", sort_by: str = "popularity.desc",
+                             page: int = 1, min_vote_count: int = 5,
+                             min_vote_average: float = None,
+                             release_date_gte: str = None,
+                             release_date_lte: str = None,
+                             with_genres: str = None,
+                             include_translations: bool = True) -> dict:
         """发现电影
 
         Args:
@@ -89,14 +150,16 @@ class TMDBClient:
             sort_by: 排序方式
             release_date_gte: 上映日期 >= (YYYY-MM-DD)
             release_date_lte: 上映日期 <= (YYYY-MM-DD)
+            include_translations: 是否请求中文标题/简介
         """
         params = {
             "with_original_language": lang,
             "sort_by": sort_by,
             "page": page,
-            "language": "zh-CN",
             "vote_count.gte": min_vote_count,
         }
+        if include_translations:
+            params.update(LANG_PARAMS)
         if min_vote_average:
             params["vote_average.gte"] = min_vote_average
         if release_date_gte:
@@ -106,35 +169,46 @@ class TMDBClient:
         if with_genres:
             params["with_genres"] = with_genres
 
-        data = self._get("/discover/movie", params=params)
+        data = await self._get("/discover/movie", params=params)
         return {
             "page": data.get("page", 1),
             "total_pages": data.get("total_pages", 0),
             "total_results": data.get("total_results", 0),
-            "results": [self._format_movie(item) for item in data.get("results", [])],
+            "results": [self._format_movie(item) for item in unique_by(data.get("results", []), "id")],
         }
 
     # ==================== Trending (趋势) ====================
 
-    def trending_tv(self, time_window: str = "week") -> list:
+    @cached(ttl=3600)
+    async def trending_tv(self, time_window: str = "week") -> list:
         """获取趋势电视剧 (全语言)
 
         Args:
             time_window: day / week
         """
-        data = self._get(f"/trending/tv/{time_window}", params={"language": "zh-CN"})
-        return [self._format_tv(item) for item in data.get("results", [])]
+        data = await self._get(f"/trending/tv/{time_window}", params=LANG_PARAMS)
+        return [self._format_tv(item) for item in unique_by(data.get("results", []), "id")]
 
-    def trending_movie(self, time_window: str = "week") -> list:
+    @cached(ttl=3600)
+    async def trending_movie(self, time_window: str = "week") -> list:
         """获取趋势电影 (全语言)"""
-        data = self._get(f"/trending/movie/{time_window}", params={"language": "zh-CN"})
-        return [self._format_movie(item) for item in data.get("results", [])]
+        data = await self._get(f"/trending/movie/{time_window}", params=LANG_PARAMS)
+        return [self._format_movie(item) for item in unique_by(data.get("results", []), "id")]
 
     # ==================== Detail (详情) ====================
 
-    def tv_detail(self, tmdb_id: int) -> dict:
-        """获取电视剧详情"""
-        data = self._get(f"/tv/{tmdb_id}", params={"language": "zh-CN"})
+    @cached(ttl=86400)
+    async def tv_detail(self, tmdb_id: int, include_translations: bool = True,
+                        append: Optional[str] = None) -> dict:
+        """获取电视剧详情
+
+        Args:
+            include_translations: 是否请求中文标题/简介；为 False 时返回 TMDB 默认语言
+            append: 随详情一并获取的子资源（逗号分隔），如 "credits,external_ids"，
+                    原样放入返回结果的同名字段，避免多次请求
+        """
+        data = await self._get(f"/tv/{tmdb_id}",
+                               params=self._detail_params(include_translations, append))
         result = self._format_tv(data)
         result["seasons"] = [
             {
@@ -149,17 +223,47 @@ class TMDBClient:
         result["number_of_seasons"] = data.get("number_of_seasons")
         result["status"] = data.get("status")
         result["genres"] = [g.get("name") for g in data.get("genres", [])]
+        self._attach_appended(result, data, append)
         return result
 
-    def movie_detail(self, tmdb_id: int) -> dict:
-        """获取电影详情"""
-        data = self._get(f"/movie/{tmdb_id}", params={"language": "zh-CN"})
+    @cached(ttl=86400)
+    async def movie_detail(self, tmdb_id: int, include_translations: bool = True,
+                           append: Optional[str] = None) -> dict:
+        """获取电影详情
+
+        Args:
+            include_translations: 是否请求中文标题/简介；为 False 时返回 TMDB 默认语言
+            append: 随详情一并获取的子资源（逗号分隔），如 "credits,external_ids"，
+                    原样放入返回结果的同名字段，避免多次请求
+        """
+        data = await self._get(f"/movie/{tmdb_id}",
+                               params=self._detail_params(include_translations, append))
         result = self._format_movie(data)
         result["runtime"] = data.get("runtime")
         result["status"] = data.get("status")
         result["genres"] = [g.get("name") for g in data.get("genres", [])]
+        self._attach_appended(result, data, append)
         return result
 
+    @staticmethod
+    def _detail_params(include_translations: bool, append: Optional[str]) -> Optional[dict]:
+        """详情接口的请求参数"""
+        if not append:
+            return LANG_PARAMS if include_translations else None
+        params = {"append_to_response": append}
+        if include_translations:
+            params.update(LANG_PARAMS)
+        return params
+
+    @staticmethod
+    def _attach_appended(result: dict, data: dict, append: Optional[str]):
+        """把 append_to_response 请求的子资源放入结果（不覆盖已格式化的字段）"""
+        if append:
+            for name in append.split(","):
+                name = name.strip()
+                if name in data and name not in result:
+                    result[name] = data[name]
+
     # ==================== 格式化 ====================
 
     def _format_tv(self, item: dict) -> dict:
@@ -176,8 +280,8 @@ class TMDBClient:
             "rating": round(item.get("vote_average", 0), 1),
             "popularity": round(item.get("popularity", 0), 1),
             "overview": item.get("overview", ""),
-            "poster": f"{self.IMAGE_BASE}/w500{poster}" if poster else "",
-            "backdrop": f"{self.IMAGE_BASE}/w500{backdrop}" if backdrop else "",
+            "poster": self._img_prefix + poster if poster else "",
+            "backdrop": self._img_prefix + backdrop if backdrop else "",
         }
 
     def _format_movie(self, item: dict) -> dict:
@@ -194,6 +298,6 @@ class TMDBClient:
             "rating": round(item.get("vote_average", 0), 1),
             "popularity": round(item.get("popularity", 0), 1),
             "overview": item.get("overview", ""),
-            "poster": f"{self.IMAGE_BASE}/w500{poster}" if poster else "",
-            "backdrop": f"{self.IMAGE_BASE}/w500{backdrop}" if backdrop else "",
+            "poster": self._img_prefix + poster if poster else "",
+            "backdrop": self._img_prefix + backdrop if backdrop else "",
         }
@@ -0,0 +1,24 @@
+"""
+通用工具函数
+"""
+
+
+def unique_by(items: list, *keys: str) -> list:
+    """按指定字段去重，保留首次出现的条目
+
+    分页接口在页边界可能返回重复条目；首个字段缺失的条目无法判重，原样保留。
+
+    Args:
+        items: 原始列表
+        keys: 组成去重键的字段名，如 "tmdb_id", "season"
+    """
+    seen = set()
+    result = []
+    for item in items:
+        key = tuple(item.get(k) for k in keys)
+        if key[0] is None:
+            result.append(item)
+        elif key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result